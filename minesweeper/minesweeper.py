@@ -14,20 +14,13 @@ class Minesweeper():
         self.mines = set()
 
         # Initialize an empty field with no mines
-        self.board = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                row.append(False)
-            self.board.append(row)
+        self.board = [[False] * self.width for _ in range(self.height)]
 
-        # Add mines randomly
-        while len(self.mines) != mines:
-            i = random.randrange(height)
-            j = random.randrange(width)
-            if not self.board[i][j]:
-                self.mines.add((i, j))
-                self.board[i][j] = True
+        # Add mines randomly, drawing distinct cells in one go
+        for index in random.sample(range(height * width), mines):
+            i, j = divmod(index, width)
+            self.mines.add((i, j))
+            self.board[i][j] = True
 
         # At first, player has found no mines
         self.mines_found = set()
@@ -58,23 +51,17 @@ class Minesweeper():
         not including the cell itself.
         """
 
-        # Keep count of nearby mines
-        count = 0
-
-        # Loop over all cells within one row and column
-        for i in range(cell[0] - 1, cell[0] + 2):
-            for j in range(cell[1] - 1, cell[1] + 2):
-
-                # Ignore the cell itself
-                if (i, j) == cell:
-                    continue
+        i, j = cell
 
-                # Update count if cell in bounds and is mine
-                if 0 <= i < self.height and 0 <= j < self.width:
-                    if self.board[i][j]:
-                        count += 1
+        # Sum the rows of the 3x3 block around the cell, slicing clips
+        # the block at the edges of the board
+        count = sum(
+            sum(row[max(0, j - 1):j + 2])
+            for row in self.board[max(0, i - 1):i + 2]
+        )
 
-        return count
+        # Ignore the cell itself
+        return count - self.board[i][j]
 
     def won(self):
         """
@@ -83,59 +70,6 @@ class Minesweeper():
         return self.mines_found == self.mines
 
 
-class Sentence():
-    """
-    Logical statement about a Minesweeper game
-    A sentence consists of a set of board cells,
-    and a count of the number of those cells which are mines.
-    """
-
-    def __init__(self, cells, count):
-        self.cells = set(cells)
-        self.count = count
-
-    def __eq__(self, other):
-        return self.cells == other.cells and self.count == other.count
-
-    def __str__(self):
-        return f"{self.cells} = {self.count}"
-
-    def known_mines(self):
-        """
-        Returns the set of all cells in self.cells known to be mines.
-        """
-        if len(self.cells) == self.count:
-            return self.cells
-        return set()
-
-    def known_safes(self):
-        """
-        Returns the set of all cells in self.cells known to be safe.
-        """
-        if self.count == 0:
-            return self.cells
-        return set()
-
-    def mark_mine(self, cell):
-        """
-        Updates internal knowledge representation given the fact that
-        a cell is known to be a mine.
-        """
-        if cell in self.cells:
-            self.cells.remove(cell)
-            self.count -= 1
-
-
-    def mark_safe(self, cell):
-        """
-        Updates internal knowledge representation given the fact that
-        a cell is known to be safe.
-        """
-        if cell in self.cells:
-            self.cells.remove(cell)
-
-
-
 class MinesweeperAI():
     """
     Minesweeper game player
@@ -154,41 +88,90 @@ class MinesweeperAI():
         self.mines = set()
         self.safes = set()
 
-        # List of sentences about the game known to be true
-        self.knowledge: list[Sentence] = []
+        # Safe cells not clicked on yet, and cells that are
+        # neither clicked on nor known to be mines
+        self._available_safes = set()
+        self._candidates = set(
+            (i, j) for i in range(height) for j in range(width)
+        )
 
-    @property
-    def board_size(self):
-        return self.height * self.width
+        # Sentences about the game known to be true, each mapping
+        # a bitmask of board cells, with bit `i * width + j` set for
+        # cell (i, j), to the number of those cells which are mines
+        self.knowledge: dict[int, int] = {}
 
-    @property
-    def moves_left(self):
-        return self.board_size - len(self.moves_made) - len(self.mines)
+    def cell_bit(self, cell):
+        """
+        Returns the bitmask of a single cell
+        """
+        return 1 << (cell[0] * self.width + cell[1])
+
+    def bit_cells(self, cells):
+        """
+        Returns the set of cells in a bitmask
+        """
+        found = set()
+        while cells:
+            bit = cells & -cells
+            found.add(divmod(bit.bit_length() - 1, self.width))
+            cells ^= bit
+        return found
 
     def mark_mine(self, cell):
         """
         Marks a cell as a mine, and updates all knowledge
         to mark that cell as a mine as well.
+        Returns the set of cells of the sentences that were reduced.
         """
-        self.mines.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_mine(cell)
+        return self.mark_cells(0, self.cell_bit(cell))
 
     def mark_safe(self, cell):
         """
         Marks a cell as safe, and updates all knowledge
         to mark that cell as safe as well.
+        Returns the set of cells of the sentences that were reduced.
+        """
+        return self.mark_cells(self.cell_bit(cell), 0)
+
+    def mark_cells(self, safes, mines):
+        """
+        Marks the cells in the bitmasks `safes` and `mines` as safe
+        and as mines, and updates all knowledge in a single pass.
+        Returns the set of cells of the sentences that were reduced.
         """
-        self.safes.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_safe(cell)
+        for cell in self.bit_cells(safes):
+            self.safes.add(cell)
+            if cell not in self.moves_made:
+                self._available_safes.add(cell)
+        for cell in self.bit_cells(mines):
+            self.mines.add(cell)
+            self._candidates.discard(cell)
+
+        known = safes | mines
+        knowledge = dict()
+        changed = set()
+        for cells, count in self.knowledge.items():
+            if cells & known:
+                count -= (cells & mines).bit_count()
+                cells &= ~known
+                changed.add(cells)
+
+            # Drop sentences with no cells left, which includes every
+            # resolved sentence once its cells are marked, and sentences
+            # that became duplicates of another one
+            if cells:
+                knowledge.setdefault(cells, count)
+
+        self.knowledge = knowledge
+        changed.discard(0)
+        return changed
 
     def get_neighbours(self, cell, count):
         """
-        Returns a set of neighbouring cells and the count of mines
+        Returns a bitmask of neighbouring cells and the count of mines
         in those cells
         """
-        neighbouring_cells = set()
+        neighbouring_cells = 0
         row = cell[0]
         column = cell[1]
 
@@ -202,46 +185,63 @@ class MinesweeperAI():
                     continue
 
                 if 0 <= i < self.height and 0 <= j < self.width:
-                    neighbouring_cells.add((i, j))
+                    neighbouring_cells |= self.cell_bit((i, j))
 
         return neighbouring_cells, count
 
     def update_safes_mines(self):
         """
         Updates the safes and mines sets
-        based on the knowledge base
+        based on the knowledge base, and returns the set of cells
+        of the sentences that were reduced
         """
-        safes = set()
-        mines = set()
-        for sentence in self.knowledge:
-            safes.update(sentence.known_safes())
-            mines.update(sentence.known_mines())
-
-        if safes:
-            for safe in safes:
-                self.mark_safe(safe)
-        if mines:
-            for mine in mines:
-                self.mark_mine(mine)
-
-    def add_new_sentences(self):
+        safes = 0
+        mines = 0
+        for cells, count in self.knowledge.items():
+            if count == 0:
+                safes |= cells
+            elif cells.bit_count() == count:
+                mines |= cells
+
+        if safes or mines:
+            return self.mark_cells(safes, mines)
+        return set()
+
+    def add_sentence(self, cells, count):
         """
-        Tries to infer new sentences based on the knowledge base
+        Adds a sentence to the knowledge base,
+        returns False if it was already known or has no cells
         """
-        for sentence_1 in self.knowledge:
-            for sentence_2 in self.knowledge:
+        if not cells or cells in self.knowledge:
+            return False
 
-                if sentence_1 == sentence_2:
-                    continue
+        self.knowledge[cells] = count
+        return True
 
-                if sentence_1.cells.issubset(sentence_2.cells):
-                    new_sentence_cells = sentence_2.cells - sentence_1.cells
-                    new_sentence_count = sentence_2.count - sentence_1.count
+    def add_new_sentences(self, sentences):
+        """
+        Tries to infer new sentences by comparing the (cells, count)
+        pairs in `sentences`, and any sentence inferred from them,
+        with the knowledge base
+        """
+        pending = list(sentences)
+        while pending:
+            cells_1, count_1 = pending.pop()
+            for cells_2, count_2 in list(self.knowledge.items()):
 
-                    new_sentence = Sentence(new_sentence_cells, new_sentence_count)
+                if cells_1 == cells_2:
+                    continue
 
-                    if new_sentence not in self.knowledge:
-                        self.knowledge.append(new_sentence)
+                common = cells_1 & cells_2
+                if common == cells_1:
+                    new_sentence = cells_2 & ~cells_1, count_2 - count_1
+                elif common == cells_2:
+                    new_sentence = cells_1 & ~cells_2, count_1 - count_2
+                else:
+                    continue
+
+                if self.add_sentence(*new_sentence):
+                    pending.append(new_sentence)
 
     def add_knowledge(self, cell, count):
         """
@@ -259,14 +259,23 @@ class MinesweeperAI():
                if they can be inferred from existing knowledge
         """
         self.moves_made.add(cell)
-        self.mark_safe(cell)
+        self._available_safes.discard(cell)
+        self._candidates.discard(cell)
+        changed = self.mark_safe(cell)
 
         neighbours, new_count = self.get_neighbours(cell, count)
-        self.knowledge.append(Sentence(neighbours, new_count))
+        self.add_sentence(neighbours, new_count)
 
-        self.update_safes_mines()
+        changed |= self.update_safes_mines()
 
-        self.add_new_sentences()
+        # Only the new sentence and the sentences reduced by marking
+        # can be part of a subset pair that was not compared before
+        changed.add(neighbours)
+        self.add_new_sentences(
+            (cells, self.knowledge[cells])
+            for cells in changed
+            if cells in self.knowledge
+        )
 
     def make_safe_move(self):
         """
@@ -277,18 +286,7 @@ class MinesweeperAI():
         This function may use the knowledge in self.mines, self.safes
         and self.moves_made, but should not modify any of those values.
         """
-
-        # Return None if no safe moves available:
-        if len(self.safes) == 0:
-            return None
-
-        # Return a safe move if available:
-        for move in self.safes:
-            if move not in self.moves_made:
-                return move
-
-        # Return None if no safe moves available:
-        return None
+        return next(iter(self._available_safes), None)
 
     def make_random_move(self):
         """
@@ -297,12 +295,7 @@ class MinesweeperAI():
             1) have not already been chosen, and
             2) are not known to be mines
         """
-        if self.moves_left == 0:
+        if not self._candidates:
             return None
 
-        while True:
-            i = random.randrange(self.height)
-            j = random.randrange(self.width)
-            cell = (i, j)
-            if cell not in self.moves_made and cell not in self.mines:
-                return cell
+        return random.choice(tuple(self._candidates))
@@ -0,0 +1,39 @@
+from minesweeper import Minesweeper, MinesweeperAI
+
+
+def make_game(height, width, mines):
+    game = Minesweeper(height, width, 0)
+    for i, j in mines:
+        game.mines.add((i, j))
+        game.board[i][j] = True
+    return game
+
+
+def test_infers_from_sentences_reduced_by_marking():
+    # Marking cells shrinks older sentences into new subset pairs,
+    # (0, 0) can only be found by comparing those
+    game = make_game(3, 5, {(1, 2), (2, 1), (0, 0)})
+    ai = MinesweeperAI(3, 5)
+    for cell in [(0, 1), (1, 0), (0, 2), (0, 4), (1, 4)]:
+        ai.add_knowledge(cell, game.nearby_mines(cell))
+
+    assert (0, 0) in ai.mines
+    assert ai.mines <= game.mines
+    assert not ai.safes & game.mines
+
+
+def test_infers_from_sentences_reduced_by_the_move():
+    # Marking the clicked cell safe also shrinks older sentences
+    game = make_game(3, 4, {(0, 3), (1, 1), (2, 2)})
+    ai = MinesweeperAI(3, 4)
+    for cell in [(2, 0), (0, 1), (2, 1), (0, 0)]:
+        ai.add_knowledge(cell, game.nearby_mines(cell))
+
+    assert {(0, 2), (1, 2)} <= ai.safes
+    assert ai.mines <= game.mines
+    assert not ai.safes & game.mines
+
+
+if __name__ == "__main__":
+    test_infers_from_sentences_reduced_by_marking()
+    test_infers_from_sentences_reduced_by_the_move()
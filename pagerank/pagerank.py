@@ -1,11 +1,16 @@
+import bisect
 import os
-import random
 import re
 import sys
 
+import numpy as np
+
 DAMPING = 0.85
 SAMPLES = 10000
 
+# Links in an HTML page, matched on the raw bytes of the file
+LINK_PATTERN = re.compile(rb"<a\s+(?:[^>]*?)href=\"([^\"]*)\"")
+
 
 def main():
     if len(sys.argv) != 2:
@@ -33,17 +38,13 @@ def crawl(directory):
     for filename in os.listdir(directory):
         if not filename.endswith(".html"):
             continue
-        with open(os.path.join(directory, filename)) as f:
-            contents = f.read()
-            links = re.findall(r"<a\s+(?:[^>]*?)href=\"([^\"]*)\"", contents)
-            pages[filename] = set(links) - {filename}
+        with open(os.path.join(directory, filename), "rb") as f:
+            links = LINK_PATTERN.findall(f.read())
+            pages[filename] = set(link.decode() for link in links) - {filename}
 
     # Only include links to other pages in the corpus
     for filename in pages:
-        pages[filename] = set(
-            link for link in pages[filename]
-            if link in pages
-        )
+        pages[filename] &= pages.keys()
 
     return pages
 
@@ -57,96 +58,133 @@ def transition_model(corpus, page, damping_factor):
     linked to by `page`. With probability `1 - damping_factor`, choose
     a link at random chosen from all pages in the corpus.
     """
-    prob_dist = dict()
-    number_of_pages = len(corpus)
-
+    pages = list(corpus)
+    ids = {p: i for i, p in enumerate(pages)}
+    weights = transition_weights(corpus, ids, page, damping_factor)
+    return dict(zip(pages, weights.tolist()))
 
-    for p in corpus:
 
-        rank = (1 - damping_factor) / number_of_pages
-
-        # If page has no links
-        # add equal probability to all pages with damping factor
-        if len(corpus[page]) == 0:
-            prob_dist[p] = rank
-            continue
-
-        if p in corpus[page]:
-            rank += damping_factor / len(corpus[page])
+def transition_weights(corpus, ids, page, damping_factor):
+    """
+    Return the distribution of `transition_model` as an array,
+    where `ids` maps every page to its index in the array.
+    """
+    number_of_pages = len(ids)
+    links = corpus[page]
 
-        prob_dist[p] = rank
+    # If page has no links
+    # add equal probability to all pages
+    if len(links) == 0:
+        return np.full(number_of_pages, 1 / number_of_pages)
 
-    return prob_dist
+    weights = np.full(number_of_pages, (1 - damping_factor) / number_of_pages)
+    weights[[ids[p] for p in links]] += damping_factor / len(links)
+    return weights
 
 
-def sample_pagerank(corpus, damping_factor, n):
+def sample_pagerank(corpus, damping_factor, n, seed=None):
     """
     Return PageRank values for each page by sampling `n` pages
     according to transition model, starting with a page at random.
+    `seed` is passed to `np.random.default_rng`, so an int or a
+    Generator makes the sampling reproducible.
 
     Return a dictionary where keys are page names, and values are
     their estimated PageRank value (a value between 0 and 1). All
     PageRank values should sum to 1.
     """
-    page_rank = dict()
-    for p in corpus:
-        page_rank[p] = 0
+    if n == 0:
+        return {p: 0 for p in corpus}
+
+    pages = list(corpus)
+    ids = {p: i for i, p in enumerate(pages)}
+    number_of_pages = len(pages)
+
+    # transition_model only depends on the current page, so compute it
+    # once per visited page, cumulated so the next page can be found
+    # by binary search. Single lookups are much cheaper with bisect on
+    # a list than with a NumPy call per step.
+    cdfs = dict()
+
+    rng = np.random.default_rng(seed)
+    draws = rng.random(n).tolist()
+    visits = [0] * n
 
     # random page to start with
-    current_page = random.choice(list(corpus.keys()))
+    current_page = int(rng.integers(number_of_pages))
 
-    for _ in range(n):
-        # update page rank for the current page
-        page_rank[current_page] += 1 / n
+    for i in range(n):
+        visits[i] = current_page
 
-        # get the probability distribution for the next page
-        prob_dist = transition_model(corpus, current_page, damping_factor)
+        cdf = cdfs.get(current_page)
+        if cdf is None:
+            cdf = transition_weights(
+                corpus, ids, pages[current_page], damping_factor
+            ).cumsum()
+            # make sure the CDF ends at exactly 1 despite rounding
+            cdf /= cdf[-1]
+            cdf = cdfs[current_page] = cdf.tolist()
 
         # choose next page based on the probability distribution
-        next_page = random.choices(
-            list(prob_dist.keys()),
-            weights=list(prob_dist.values()),
-        )[0]
+        current_page = bisect.bisect(cdf, draws[i])
 
-        current_page = next_page
-    # print(sum(page_rank.values()))
-    return page_rank
+    counts = np.bincount(visits, minlength=number_of_pages)
+    return dict(zip(pages, (counts / n).tolist()))
 
 
-def update_page_ranks(
-    corpus,
-    page_rank,
-    prev_page_rank,
-    damping_factor,
-    n,
-):
-    for page in corpus:
-        if len(corpus[page]) == 0:
-            corpus[page] = set(corpus.keys())
-            print(f"Page {page} has no links. Adding links to all pages in corpus.")
+def link_matrix(corpus):
+    """
+    Return the pages of `corpus` along with its link structure in
+    compressed sparse row form.
 
-        new_rank = (1 - damping_factor) / n
-        for incoming_page, links in corpus.items():
-            # if the incoming page has a link to the current page
-            # then add the incoming page's rank divided by the number of links
-            # to the current page
-            if page in links:
-                new_rank += damping_factor * prev_page_rank[incoming_page] / len(links)
-        page_rank[page] = new_rank
-    return page_rank
+    Page `pages[i]` links to `indices[indptr[i]:indptr[i + 1]]`, and
+    `inv_outdeg[i]` is one over the number of those links. A page with no
+    links has no entries and an `inv_outdeg` of 0, rather than one link
+    to every page in the corpus.
+    """
+    pages = list(corpus)
+    ids = {page: i for i, page in enumerate(pages)}
+    n = len(pages)
 
+    indptr = [0]
+    indices = []
+    for page in pages:
+        indices.extend(ids[link] for link in corpus[page])
+        indptr.append(len(indices))
 
-def calculate_accuracy(page_rank, prev_page_rank):
-    accuracy = 0
-    for p in page_rank:
-        accuracy += abs(page_rank[p] - prev_page_rank[p])
-    return accuracy
+    indptr = np.array(indptr, dtype=np.int32)
+    indices = np.array(indices, dtype=np.int32)
+    outdeg = np.diff(indptr).astype(np.float64)
+    inv_outdeg = np.divide(1, outdeg, out=np.zeros(n), where=outdeg > 0)
+    return pages, indptr, indices, inv_outdeg
 
 
-def update_previous_page_ranks(corpus, page_rank, prev_page_rank):
-    for p in corpus:
-        prev_page_rank[p] = page_rank[p]
-    return prev_page_rank
+def update_page_ranks(
+    sources,
+    indices,
+    link_weights,
+    dangling,
+    prev_page_rank,
+    page_rank,
+    damping_factor,
+):
+    """
+    Write the page ranks after one iteration into `page_rank`, given the
+    ranks from the previous iteration, and return the total change
+    between the two.
+
+    Link k goes from page `sources[k]` to page `indices[k]` and passes on
+    `link_weights[k]` of the source page's rank. The pages in `dangling`
+    have no links and pass on their rank to every page equally.
+    """
+    n = len(prev_page_rank)
+    page_rank[:] = np.bincount(
+        indices, weights=link_weights * prev_page_rank[sources], minlength=n
+    )
+    page_rank += (
+        1 - damping_factor + damping_factor * prev_page_rank[dangling].sum()
+    ) / n
+    return np.abs(page_rank - prev_page_rank).sum()
 
 
 def iterate_pagerank(corpus, damping_factor):
@@ -161,27 +199,34 @@ def iterate_pagerank(corpus, damping_factor):
 
     accuracy = 1
     desired_accuracy = 0.001
-    n = len(corpus)
 
-    # set current page rank to 1 / n
-    page_rank = dict()
-    for p in corpus:
-        page_rank[p] = 1 / n
+    pages, indptr, indices, inv_outdeg = link_matrix(corpus)
+    n = len(pages)
+
+    # every page passes an equal share of its rank along each of its links
+    sources = np.repeat(np.arange(n), np.diff(indptr))
+    link_weights = damping_factor * inv_outdeg[sources]
+    dangling = np.flatnonzero(inv_outdeg == 0)
 
-    # set previous page rank to 0
-    prev_page_rank = dict()
-    for p in corpus:
-        prev_page_rank[p] = 0
+    # set initial page rank to 1 / n
+    page_rank = np.full(n, 1 / n)
+    prev_page_rank = np.empty(n)
 
-    # iterate until desired accuracy is reached
+    # iterate until desired accuracy is reached,
+    # reusing the two rank buffers
     while accuracy > desired_accuracy:
-        page_rank = update_page_ranks(
-            corpus, page_rank, prev_page_rank, damping_factor, n
+        prev_page_rank, page_rank = page_rank, prev_page_rank
+        accuracy = update_page_ranks(
+            sources,
+            indices,
+            link_weights,
+            dangling,
+            prev_page_rank,
+            page_rank,
+            damping_factor,
         )
-        accuracy = calculate_accuracy(page_rank, prev_page_rank)
-        prev_page_rank = update_previous_page_ranks(corpus, page_rank, prev_page_rank)
-    # print(sum(page_rank.values()))
-    return page_rank
+
+    return dict(zip(pages, page_rank.tolist()))
 
 
 if __name__ == "__main__":
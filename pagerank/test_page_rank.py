@@ -1,4 +1,4 @@
-from pagerank import transition_model
+from pagerank import crawl, iterate_pagerank, sample_pagerank, transition_model
 
 
 def test_transition_model():
@@ -16,6 +16,82 @@ def test_transition_model():
     assert abs(prob["2.html"] - 0.475) < 0.001
     assert abs(prob["3.html"] - 0.475) < 0.001
 
+    # a page with no links goes to every page with equal probability
+    corpus["3.html"] = set()
+    prob = transition_model(corpus, "3.html", damping_factor)
+    assert abs(sum(prob.values()) - 1) < 0.001
+    for p in corpus:
+        assert abs(prob[p] - 1 / 3) < 0.001
+
+
+def test_iterate_pagerank():
+    ranks = iterate_pagerank(crawl("corpus0"), 0.85)
+    assert abs(sum(ranks.values()) - 1) < 0.001
+    assert abs(ranks["1.html"] - 0.2202) < 0.001
+    assert abs(ranks["2.html"] - 0.4289) < 0.001
+    assert abs(ranks["3.html"] - 0.2202) < 0.001
+    assert abs(ranks["4.html"] - 0.1307) < 0.001
+
+
+def test_iterate_pagerank_no_links():
+    corpus = {"1.html": {"2.html"}, "2.html": set()}
+    ranks = iterate_pagerank(corpus, 0.85)
+    assert abs(sum(ranks.values()) - 1) < 0.001
+    assert ranks["2.html"] > ranks["1.html"]
+
+
+def test_iterate_pagerank_fixed_point():
+    # corpus2 has a page without links and a page without incoming links
+    corpus = crawl("corpus2")
+    ranks = iterate_pagerank(corpus, 0.85)
+    n = len(corpus)
+    for page in corpus:
+        expected = 0.15 / n
+        for incoming_page, links in corpus.items():
+            if not links:
+                expected += 0.85 * ranks[incoming_page] / n
+            elif page in links:
+                expected += 0.85 * ranks[incoming_page] / len(links)
+        assert abs(ranks[page] - expected) < 0.001
+
+
+def test_sample_pagerank():
+    corpus = crawl("corpus0")
+    ranks = sample_pagerank(corpus, 0.85, 10000)
+    expected = iterate_pagerank(corpus, 0.85)
+    assert abs(sum(ranks.values()) - 1) < 0.001
+    for page in corpus:
+        assert abs(ranks[page] - expected[page]) < 0.05
+
+
+def test_sample_pagerank_no_links():
+    # recursion.html has no links
+    corpus = crawl("corpus2")
+    ranks = sample_pagerank(corpus, 0.85, 10000)
+    expected = iterate_pagerank(corpus, 0.85)
+    assert abs(sum(ranks.values()) - 1) < 0.001
+    for page in corpus:
+        assert abs(ranks[page] - expected[page]) < 0.05
+
+
+def test_sample_pagerank_seed():
+    corpus = crawl("corpus1")
+    assert sample_pagerank(corpus, 0.85, 1000, seed=1) == sample_pagerank(
+        corpus, 0.85, 1000, seed=1
+    )
+
+
+def test_sample_pagerank_no_samples():
+    corpus = crawl("corpus0")
+    assert sample_pagerank(corpus, 0.85, 0) == {p: 0 for p in corpus}
+
 
 if __name__ == "__main__":
     test_transition_model()
+    test_iterate_pagerank()
+    test_iterate_pagerank_no_links()
+    test_iterate_pagerank_fixed_point()
+    test_sample_pagerank()
+    test_sample_pagerank_no_links()
+    test_sample_pagerank_seed()
+    test_sample_pagerank_no_samples()
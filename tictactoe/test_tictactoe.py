@@ -0,0 +1,98 @@
+import random
+
+import tictactoe as ttt
+from tictactoe import EMPTY, O, X
+
+
+def reference_value(board, values):
+    # plain minimax over the full game tree, memoised by board
+    key = tuple(cell for row in board for cell in row)
+    if key not in values:
+        if ttt.terminal(board):
+            values[key] = ttt.utility(board)
+        else:
+            scores = [
+                reference_value(ttt.result(board, action), values)
+                for action in ttt.actions(board)
+            ]
+            if ttt.player(board) == X:
+                values[key] = max(scores)
+            else:
+                values[key] = min(scores)
+    return values[key]
+
+
+def reachable_boards():
+    boards = []
+    seen = set()
+    pending = [ttt.initial_state()]
+    while pending:
+        board = pending.pop()
+        key = tuple(cell for row in board for cell in row)
+        if key in seen:
+            continue
+        seen.add(key)
+        boards.append(board)
+        if not ttt.terminal(board):
+            for action in sorted(ttt.actions(board)):
+                pending.append(ttt.result(board, action))
+    return boards
+
+
+def check_minimax(boards, clear_table):
+    values = dict()
+    ttt.TRANSPOSITIONS.clear()
+    for board in boards:
+        if clear_table:
+            ttt.TRANSPOSITIONS.clear()
+        move = ttt.minimax(board)
+        if ttt.terminal(board):
+            assert move is None
+        else:
+            assert move in ttt.actions(board)
+            # the move keeps the best value the player can get
+            assert reference_value(
+                ttt.result(board, move), values
+            ) == reference_value(board, values)
+
+
+def test_minimax():
+    check_minimax(reachable_boards(), clear_table=True)
+
+
+def test_minimax_shared_table():
+    # entries stored while searching one board are reused for others,
+    # whatever order the boards come in
+    boards = reachable_boards()
+    random.Random(0).shuffle(boards)
+    check_minimax(boards, clear_table=False)
+
+
+def test_player():
+    assert ttt.player(ttt.initial_state()) == X
+    assert ttt.player([[X, EMPTY, EMPTY], [EMPTY] * 3, [EMPTY] * 3]) == O
+    assert ttt.player([[X, O, EMPTY], [EMPTY] * 3, [EMPTY] * 3]) == X
+
+
+def test_winner():
+    assert ttt.winner(ttt.initial_state()) is None
+    assert ttt.winner([[X, X, X], [O, O, EMPTY], [EMPTY] * 3]) == X
+    assert ttt.winner([[X, X, O], [X, O, EMPTY], [O, EMPTY, EMPTY]]) == O
+    assert ttt.winner([[X, O, EMPTY], [X, O, EMPTY], [X, EMPTY, EMPTY]]) == X
+    assert ttt.winner([[X, O, X], [X, O, O], [O, X, X]]) is None
+
+
+def test_terminal():
+    assert not ttt.terminal(ttt.initial_state())
+    assert not ttt.terminal([[X, O, X], [EMPTY, O, EMPTY], [EMPTY] * 3])
+    assert ttt.terminal([[X, X, X], [O, O, EMPTY], [EMPTY] * 3])
+    # a full board without a line is a draw
+    assert ttt.terminal([[X, O, X], [X, O, O], [O, X, X]])
+
+
+if __name__ == "__main__":
+    test_minimax()
+    test_minimax_shared_table()
+    test_player()
+    test_winner()
+    test_terminal()
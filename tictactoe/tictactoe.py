@@ -8,6 +8,54 @@ O = "O"
 EMPTY = None
 STATES_EXPLORED = 0
 
+# Integer values of the cells as used by the search
+CELL_VALUES = {X: 1, O: -1, EMPTY: 0}
+WINNERS = {1: X, -1: O, 0: None}
+
+# Rows, columns and diagonals as indices into a flat board
+LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6),
+)
+
+# Lines through each cell, a move can only complete one of these
+LINES_THROUGH = tuple(
+    tuple(line for line in LINES if k in line) for k in range(9)
+)
+
+# 2-bit code of each player in a board key
+KEY_CODES = {1: 1, -1: 2}
+
+# Where each cell ends up under the 8 rotations and reflections of the
+# board, boards that map onto each other share a transposition entry
+SYMMETRIES = tuple(
+    tuple(3 * i + j for i, j in (transform(*divmod(k, 3)) for k in range(9)))
+    for transform in (
+        lambda i, j: (i, j),
+        lambda i, j: (j, 2 - i),
+        lambda i, j: (2 - i, 2 - j),
+        lambda i, j: (2 - j, i),
+        lambda i, j: (i, 2 - j),
+        lambda i, j: (2 - i, j),
+        lambda i, j: (j, i),
+        lambda i, j: (2 - j, 2 - i),
+    )
+)
+
+# Bit offset of each cell in the key of every symmetric board
+KEY_SHIFTS = tuple(
+    tuple(2 * symmetry[k] for symmetry in SYMMETRIES) for k in range(9)
+)
+
+# Kind of value stored in the transposition table
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# Searched boards by key, as (value, kind of value)
+TRANSPOSITIONS = {}
+
 
 class InvalidActionError(Exception):
     pass
@@ -26,13 +74,8 @@ def player(board):
     """
     Returns player who has the next turn on a board.
     """
-    x_count = 0
-    o_count = 0
-    for row in board:
-        x_count += row.count(X)
-        o_count += row.count(O)
-
-    if x_count <= o_count:
+    # X and O cancel out, so the sum is 0 when it's X's turn
+    if sum(encode(board)) <= 0:
         return X
     else:
         return O
@@ -63,101 +106,169 @@ def result(board, action):
     return new_board
 
 
-def check_win(row):
-    x_count = row.count(X)
-    o_count = row.count(O)
-    if x_count == 3:
-        return X
-    elif o_count == 3:
-        return O
-    else:
-        return None
-
-
 def winner(board):
     """
     Returns the winner of the game, if there is one.
     """
-    for i in range(len(board)):
-        # check rows
-        row = board[i]
-        result = check_win(row)
-        if result:
-            return result
-
-        # check columns
-        column = [board[j][i] for j in range(len(board))]
-        result = check_win(column)
-        if result:
-            return result
-
-    # check diagonals
-    diagonal1 = [board[i][i] for i in range(len(board))]
-    result = check_win(diagonal1)
-    if result:
-        return result
-
-    diagonal2 = [board[i][len(board) - 1 - i] for i in range(len(board))]
-    result = check_win(diagonal2)
-    if result:
-        return result
-
-    return None
+    return WINNERS[line_winner(encode(board))]
 
 
 def terminal(board):
     """
     Returns True if game is over, False otherwise.
     """
-    if winner(board) or not actions(board):
-        return True
-    else:
-        return False
+    cells = encode(board)
+    return line_winner(cells) != 0 or 0 not in cells
 
 
 def utility(board):
     """
     Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
     """
+    return line_winner(encode(board))
 
-    result = winner(board)
-    if result == X:
-        return 1
-    elif result == O:
-        return -1
+
+def encode(board):
+    """
+    Returns the board as a flat list of 9 cells,
+    1 for X, -1 for O and 0 for an empty cell.
+    """
+    return [CELL_VALUES[cell] for row in board for cell in row]
+
+
+def line_winner(cells):
+    """
+    Returns 1 if X has a full line on the encoded board,
+    -1 if O has one, 0 otherwise.
+    """
+    for a, b, c in LINES:
+        line = cells[a] + cells[b] + cells[c]
+        if line == 3:
+            return 1
+        if line == -3:
+            return -1
+    return 0
+
+
+def completes_line(cells, k):
+    """
+    Returns True if the move on cell k of the encoded board
+    completed a line for the player who made it.
+    """
+    target = 3 * cells[k]
+    for a, b, c in LINES_THROUGH[k]:
+        if cells[a] + cells[b] + cells[c] == target:
+            return True
+    return False
+
+
+def board_keys(cells):
+    """
+    Returns the keys of the encoded board and its 7 symmetric boards,
+    each a single integer using 2 bits per cell.
+    """
+    keys = (0,) * len(SYMMETRIES)
+    for k in range(9):
+        if cells[k]:
+            keys = play(keys, k, cells[k])
+    return keys
+
+
+def play(keys, k, value):
+    """
+    Returns the board keys after the player with cell value `value`
+    moves on cell k.
+    """
+    code = KEY_CODES[value]
+    return tuple(key | code << shift for key, shift in zip(keys, KEY_SHIFTS[k]))
+
+
+def lookup(key, alpha, beta):
+    """
+    Returns the value of a searched board if the transposition table
+    decides it for the window (alpha, beta), None otherwise.
+    """
+    entry = TRANSPOSITIONS.get(key)
+    if entry is None:
+        return None
+    v, kind = entry
+    if (
+        kind == EXACT
+        or (kind == LOWER_BOUND and v >= beta)
+        or (kind == UPPER_BOUND and v <= alpha)
+    ):
+        return v
+    return None
+
+
+def store(key, v, alpha, beta):
+    """
+    Stores the value of a board searched with window (alpha, beta).
+    """
+    if v <= alpha:
+        TRANSPOSITIONS[key] = (v, UPPER_BOUND)
+    elif v >= beta:
+        TRANSPOSITIONS[key] = (v, LOWER_BOUND)
     else:
-        return 0
+        TRANSPOSITIONS[key] = (v, EXACT)
 
 
-def max_value(board, alpha, beta):
+def max_value(cells, keys, move, alpha, beta):
     global STATES_EXPLORED
+    # only O's last move can have ended the game with a win
+    if completes_line(cells, move):
+        return -1
+    if 0 not in cells:
+        return 0
+
+    key = min(keys)
+    v = lookup(key, alpha, beta)
+    if v is not None:
+        return v
     STATES_EXPLORED += 1
-    if terminal(board):
-        return utility(board)
 
+    window = alpha, beta
     v = -2
-    for action in actions(board):
-        v = max(v, min_value(result(board, action), alpha, beta))
+    for k in range(9):
+        if cells[k]:
+            continue
+        # play the move in place and undo it after searching
+        cells[k] = 1
+        v = max(v, min_value(cells, play(keys, k, 1), k, alpha, beta))
+        cells[k] = 0
         alpha = max(alpha, v)
         if alpha >= beta:
             break
+    store(key, v, *window)
     return v
 
 
-def min_value(board, alpha, beta):
+def min_value(cells, keys, move, alpha, beta):
     global STATES_EXPLORED
-    STATES_EXPLORED += 1
+    if completes_line(cells, move):
+        return 1
+    if 0 not in cells:
+        return 0
 
-    if terminal(board):
-        return utility(board)
+    key = min(keys)
+    v = lookup(key, alpha, beta)
+    if v is not None:
+        return v
+    STATES_EXPLORED += 1
 
+    window = alpha, beta
     v = 2
-    for action in actions(board):
-        v = min(v, max_value(result(board, action), alpha, beta))
+    for k in range(9):
+        if cells[k]:
+            continue
+        cells[k] = -1
+        v = min(v, max_value(cells, play(keys, k, -1), k, alpha, beta))
+        cells[k] = 0
         beta = min(beta, v)
         if beta <= alpha:
             break
 
+    store(key, v, *window)
     return v
 
 
@@ -169,28 +280,53 @@ def minimax(board):
     if terminal(board):
         return None
 
+    cells = encode(board)
+
+    # Every opening move draws with best play, so take a corner
+    if not any(cells):
+        return (0, 0)
+
+    keys = board_keys(cells)
+    best_move = None
+    alpha = -2
+    beta = 2
+
+    # Moves that give symmetric boards have the same score,
+    # so only search one of them
+    searched = set()
+
     if player(board) == X:
         best_score = -2
-        alpha = -2
-        beta = 2
-        best_move = None
-        for action in actions(board):
-            score = min_value(result(board, action), alpha, beta)
+        for k in range(9):
+            if cells[k]:
+                continue
+            next_keys = play(keys, k, 1)
+            if min(next_keys) in searched:
+                continue
+            searched.add(min(next_keys))
+            cells[k] = 1
+            score = min_value(cells, next_keys, k, alpha, beta)
+            cells[k] = 0
             if score > best_score:
                 best_score = score
-                best_move = action
+                best_move = divmod(k, 3)
             alpha = max(alpha, score)
 
     else:
         best_score = 2
-        best_move = None
-        alpha = -2
-        beta = 2
-        for action in actions(board):
-            score = max_value(result(board, action), alpha, beta)
+        for k in range(9):
+            if cells[k]:
+                continue
+            next_keys = play(keys, k, -1)
+            if min(next_keys) in searched:
+                continue
+            searched.add(min(next_keys))
+            cells[k] = -1
+            score = max_value(cells, next_keys, k, alpha, beta)
+            cells[k] = 0
             if score < best_score:
                 best_score = score
-                best_move = action
+                best_move = divmod(k, 3)
             beta = min(beta, score)
     print("States explored: ", STATES_EXPLORED)
     return best_move